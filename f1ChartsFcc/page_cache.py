@@ -0,0 +1,253 @@
+import functools
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+import plotly
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se guardan identity y gzip
+    brotli = None
+
+
+# Orden de preferencia cuando el cliente acepta varias codificaciones con el mismo q
+_ENCODINGS = [
+    ("br", ".br"),
+    ("gzip", ".gz"),
+    ("identity", ""),
+]
+
+_KEY_RE = re.compile(r"[^a-z0-9_-]+")
+
+# La compresión corre dentro de la petición del primer visitante: cada página
+# incluye plotly.js (~4.7 MB) y brotli a calidad 11 tarda >15 s. Con estos
+# niveles son ~0.2 s cada uno y brotli sigue por debajo de gzip -9.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_version():
+    """Hashes the code, lists and templates that shape the cached pages.
+
+    Any change to them (a deploy) yields a new directory, so old pages go stale
+    without having to delete them by hand.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = [
+        os.path.join(package_dir, "views.py"),
+        os.path.join(package_dir, "page_cache.py"),
+    ]
+    # Los desplegables de carreras y pilotos salen de estas listas
+    lists_dir = os.path.join(package_dir, "lists")
+    sources.extend(
+        os.path.join(lists_dir, fname) for fname in os.listdir(lists_dir) if fname.endswith(".py")
+    )
+    for template_dir in settings.TEMPLATES[0]["DIRS"]:
+        for root, _, files in os.walk(template_dir):
+            sources.extend(os.path.join(root, fname) for fname in files)
+
+    digest = hashlib.sha256(plotly.__version__.encode())
+    for source in sorted(sources):
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def _page_cache_path(name, key):
+    """Builds the identity file path for a cached page."""
+    key = _KEY_RE.sub("_", key.lower())
+    return os.path.join(settings.PAGE_CACHE_ROOT, _cache_version(), name, f"{key}.html")
+
+
+def _write_atomic(path, data):
+    """Writes bytes to a temp file and renames it so readers never see partial files."""
+    # Nombre temporal único por escritor: dos workers pueden generar la misma página a la vez
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp crea el fichero con 0600; un servidor frontal con otro usuario debe poder leerlo
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _entry_size(path):
+    """Returns the bytes used by a page and its stored encodings."""
+    size = 0
+    for _, suffix in _ENCODINGS:
+        try:
+            size += os.path.getsize(path + suffix)
+        except OSError:
+            pass
+    return size
+
+
+def _remove_entry(path):
+    """Deletes a page; identity goes first so it stops being served right away."""
+    for suffix in ("", ".gz", ".br"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def _prune_cache(keep_path):
+    """Keeps the page cache bounded.
+
+    Removes directories left by previous cache versions and, if the current
+    version exceeds PAGE_CACHE_MAX_BYTES, evicts the oldest pages first.
+    """
+    version = _cache_version()
+    for entry in os.listdir(settings.PAGE_CACHE_ROOT):
+        if entry != version:
+            shutil.rmtree(os.path.join(settings.PAGE_CACHE_ROOT, entry), ignore_errors=True)
+
+    pages = []
+    total = 0
+    for root, _, files in os.walk(os.path.join(settings.PAGE_CACHE_ROOT, version)):
+        for fname in files:
+            if not fname.endswith(".html"):
+                continue
+            path = os.path.join(root, fname)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            size = _entry_size(path)
+            total += size
+            pages.append((mtime, size, path))
+
+    for _, size, path in sorted(pages):
+        if total <= settings.PAGE_CACHE_MAX_BYTES:
+            break
+        if path == keep_path:
+            continue
+        _remove_entry(path)
+        total -= size
+
+
+def _parse_accept_encoding(header):
+    """Returns a dict {encoding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            pname, _, pvalue = param.strip().partition("=")
+            if pname.strip().lower() == "q":
+                try:
+                    q = float(pvalue)
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def _negotiate_encoding(request, path):
+    """Picks the best stored encoding for the request.
+
+    Returns a (content_encoding, file_path) tuple; content_encoding is None for identity.
+    """
+    accepted = _parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    wildcard = accepted.get("*")
+    best = None
+    for encoding, suffix in _ENCODINGS:
+        q = accepted.get(encoding, wildcard)
+        if q is None:
+            # identity es aceptable salvo que se excluya explícitamente
+            q = 0.001 if encoding == "identity" else 0.0
+        if q <= 0 or not os.path.exists(path + suffix):
+            continue
+        if best is None or q > best[0]:
+            best = (q, encoding, path + suffix)
+    if best is None:
+        return None, path
+    _, encoding, file_path = best
+    return (None if encoding == "identity" else encoding), file_path
+
+
+def serve_cached_page(request, name, key, sources=()):
+    """Serves a previously stored page as a file-backed response, or None on a miss.
+
+    FileResponse lets the WSGI server stream the file with sendfile, so a hit
+    does not render, compress or copy the body in the Python worker. `sources`
+    are the data files the page was built from; if any is missing or newer than
+    the stored page, it counts as a miss.
+    """
+    path = _page_cache_path(name, key)
+    try:
+        page_mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    for source in sources:
+        try:
+            if os.path.getmtime(source) > page_mtime:
+                return None
+        except OSError:
+            return None
+    return _file_response(request, path)
+
+
+def _file_response(request, path):
+    """Opens the best stored encoding of `path` as a FileResponse, or None."""
+    encoding, file_path = _negotiate_encoding(request, path)
+    try:
+        f = open(file_path, "rb")
+    except OSError:
+        return None
+
+    response = FileResponse(f, content_type="text/html; charset=utf-8")
+    # FileResponse añade Content-Disposition con el nombre del fichero; no aplica a páginas
+    del response["Content-Disposition"]
+    if encoding:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def store_page(request, response, name, key):
+    """Stores a rendered page in identity, gzip and (if available) brotli encodings.
+
+    Returns the stored file negotiated for this request, so the miss is sent
+    compressed too; falls back to `response` if it cannot be opened.
+    """
+    path = _page_cache_path(name, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    body = response.content
+    _write_atomic(path + ".gz", gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0))
+    if brotli is not None:
+        _write_atomic(path + ".br", brotli.compress(body, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY))
+    else:
+        # Un .br de una generación anterior ya no corresponde a esta página
+        try:
+            os.remove(path + ".br")
+        except FileNotFoundError:
+            pass
+    # La copia identity se escribe al final: su existencia marca la entrada como completa
+    _write_atomic(path, body)
+    _prune_cache(path)
+
+    stored = _file_response(request, path)
+    if stored is not None:
+        return stored
+    # El miss también depende de Accept-Encoding para cachés intermedias
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
@@ -17,6 +17,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Páginas de gráficos precomprimidas; fuera de MEDIA_ROOT para no servirlas por /media/
+PAGE_CACHE_ROOT = os.path.join(BASE_DIR, 'page-cache')
+# Límite de disco de la caché de páginas (cada página ocupa ~7 MB entre sus tres copias)
+PAGE_CACHE_MAX_BYTES = 1024 * 1024 * 1024
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
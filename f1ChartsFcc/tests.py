@@ -0,0 +1,153 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+import brotli
+from django.http import FileResponse
+from django.shortcuts import render as django_render
+from django.test import SimpleTestCase, override_settings
+
+from .lists.drivers_list import drivers_2025
+from .lists.races_list import races_2025
+from .page_cache import _cache_version
+
+
+RACE = races_2025[0]
+TYRE_JSON = f"media/tyre-strat-charts/2025_{RACE['short_name'].lower()}_stints.json"
+TYRE_URL = f"/tyre-chart/?race={RACE['full_name']}"
+
+
+class PageCacheTests(SimpleTestCase):
+    def setUp(self):
+        # Las vistas usan rutas relativas (media/, data-scrapped/): se trabaja en un directorio temporal
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+
+        self.cache_root = os.path.join(self.tmp, "page-cache")
+        override = override_settings(PAGE_CACHE_ROOT=self.cache_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        os.makedirs(os.path.dirname(TYRE_JSON))
+        with open(TYRE_JSON, "w", encoding="utf-8") as f:
+            json.dump([{
+                "driver": "VER", "stint_length": 20, "stint": 1,
+                "compound": "MEDIUM", "base": 0, "color": "#ffd12e",
+            }], f)
+
+    def _page_path(self, name, key):
+        return os.path.join(self.cache_root, _cache_version(), name, f"{key}.html")
+
+    def _body(self, response):
+        body = b"".join(response.streaming_content)
+        response.close()
+        return body
+
+    def test_miss_then_hit_serves_stored_file(self):
+        miss = self.client.get(TYRE_URL)
+        self.assertEqual(miss.status_code, 200)
+        identity_path = self._page_path("tyre-chart", "2025_australia")
+        self.assertTrue(os.path.exists(identity_path))
+        self.assertTrue(os.path.exists(identity_path + ".gz"))
+        self.assertTrue(os.path.exists(identity_path + ".br"))
+        self._body(miss)
+
+        with mock.patch("f1ChartsFcc.views.render") as render:
+            hit = self.client.get(TYRE_URL)
+        render.assert_not_called()
+        self.assertIsInstance(hit, FileResponse)
+        self.assertEqual(hit["Content-Type"], "text/html; charset=utf-8")
+        self.assertEqual(int(hit["Content-Length"]), os.path.getsize(identity_path))
+        with open(identity_path, "rb") as f:
+            self.assertEqual(self._body(hit), f.read())
+
+    def test_negotiates_encoding(self):
+        self._body(self.client.get(TYRE_URL))
+        with open(self._page_path("tyre-chart", "2025_australia"), "rb") as f:
+            identity = f.read()
+
+        cases = [
+            ("gzip, deflate, br", "br"),
+            ("gzip", "gzip"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("*", "br"),
+            ("gzip, identity;q=0", "gzip"),
+            ("", None),
+            ("identity;q=0", None),
+            ("*;q=0", None),
+        ]
+        for header, expected in cases:
+            with self.subTest(accept_encoding=header):
+                response = self.client.get(TYRE_URL, HTTP_ACCEPT_ENCODING=header)
+                body = self._body(response)
+                self.assertEqual(response.get("Content-Encoding"), expected)
+                if expected == "br":
+                    body = brotli.decompress(body)
+                elif expected == "gzip":
+                    body = gzip.decompress(body)
+                self.assertEqual(body, identity)
+
+    def test_vary_and_no_content_disposition(self):
+        for label in ("miss", "hit"):
+            with self.subTest(label):
+                response = self.client.get(TYRE_URL, HTTP_ACCEPT_ENCODING="gzip")
+                self._body(response)
+                self.assertIn("Accept-Encoding", response["Vary"])
+                self.assertFalse(response.has_header("Content-Disposition"))
+
+    def test_newer_source_data_is_a_miss(self):
+        self._body(self.client.get(TYRE_URL))
+        future = time.time() + 60
+        os.utime(TYRE_JSON, (future, future))
+
+        with mock.patch("f1ChartsFcc.views.render", wraps=django_render) as render:
+            self._body(self.client.get(TYRE_URL))
+        render.assert_called_once()
+
+    def test_cached_files_are_world_readable(self):
+        self._body(self.client.get(TYRE_URL))
+        path = self._page_path("tyre-chart", "2025_australia")
+        for suffix in ("", ".gz", ".br"):
+            self.assertEqual(os.stat(path + suffix).st_mode & 0o777, 0o644)
+
+    def test_no_cache_without_chart(self):
+        with mock.patch("f1ChartsFcc.views.fastf1.get_session", side_effect=RuntimeError):
+            response = self.client.get(f"/qualy-delta/?race={RACE['full_name']}")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIsInstance(response, FileResponse)
+        self.assertFalse(os.path.exists(self.cache_root))
+
+    def test_comparison_only_cached_for_known_selections(self):
+        laps = [{"LapNumber": 1, "LapTime": "1:20.000"}]
+        driver = f"{drivers_2025[0]['name']} ({drivers_2025[0]['shortcode']})"
+        with mock.patch("f1ChartsFcc.views._load_or_scrape_lap_data", return_value=laps):
+            self.client.get("/comparison/", {
+                "driver1": "<a href='x'>Fake</a> (VER)", "driver2": driver, "race": RACE["full_name"],
+            })
+            self.assertFalse(os.path.exists(self.cache_root))
+
+            self._body(self.client.get("/comparison/", {
+                "driver1": driver, "driver2": driver, "race": RACE["full_name"],
+            }))
+        self.assertTrue(os.path.exists(self._page_path("comparison", "2025_australia_ver_ver")))
+
+    @override_settings(PAGE_CACHE_MAX_BYTES=1)
+    def test_prunes_old_versions_and_oversized_cache(self):
+        stale = os.path.join(self.cache_root, "old-version")
+        os.makedirs(stale)
+        old_page = self._page_path("tyre-chart", "old_page")
+        os.makedirs(os.path.dirname(old_page))
+        with open(old_page, "wb") as f:
+            f.write(b"old")
+
+        self._body(self.client.get(TYRE_URL))
+        self.assertFalse(os.path.exists(stale))
+        self.assertFalse(os.path.exists(old_page))
+        self.assertTrue(os.path.exists(self._page_path("tyre-chart", "2025_australia")))
@@ -8,6 +8,7 @@ import json
 import pandas as pd
 from .lists.races_list import races_2025
 from .lists.drivers_list import drivers_2025
+from .page_cache import serve_cached_page, store_page
 
 
 def _setup_cache():
@@ -26,6 +27,12 @@ def _normalize_race_short_name(race_short_name):
     return race_short_name.replace(" ", "_").lower()
 
 
+def _lap_data_path(driver_code, race_short):
+    """Builds the data-scrapped JSON path for a driver's laps in a race."""
+    race_short_normalized = _normalize_race_short_name(race_short)
+    return f"data-scrapped/{driver_code}_gp_{race_short_normalized}_2025.json"
+
+
 def _load_or_scrape_lap_data(driver_code, race_name, race_short):
     """Loads lap data from cache or scrapes from FastF1 if not available.
     
@@ -40,8 +47,7 @@ def _load_or_scrape_lap_data(driver_code, race_name, race_short):
     _setup_cache()
     os.makedirs('data-scrapped', exist_ok=True)
     
-    race_short_normalized = _normalize_race_short_name(race_short)
-    outname = f"data-scrapped/{driver_code}_gp_{race_short_normalized}_2025.json"
+    outname = _lap_data_path(driver_code, race_short)
     
     if os.path.exists(outname):
         with open(outname, "r", encoding="utf-8") as f:
@@ -94,6 +100,11 @@ def tyre_strategy_chart(request):
     os.makedirs(data_dir, exist_ok=True)
     json_path = os.path.join(data_dir, f"2025_{race_short.lower()}_stints.json")
 
+    page_key = f"2025_{race_short}"
+    cached = serve_cached_page(request, "tyre-chart", page_key, sources=[json_path])
+    if cached is not None:
+        return cached
+
     if os.path.exists(json_path):
         # Leer datos procesados
         with open(json_path, "r", encoding="utf-8") as f:
@@ -167,11 +178,12 @@ def tyre_strategy_chart(request):
     )
 
     chart_html = pio.to_html(fig, full_html=False)
-    return render(request, "tyre_chart.html", {
+    response = render(request, "tyre_chart.html", {
         "chart_html": chart_html,
         "races": [r["full_name"] for r in races_2025],
         "selected_race": selected_race
     })
+    return store_page(request, response, "tyre-chart", page_key)
 
 def qualy_delta_view(request):
     """Gráfico de diferencias a la pole por piloto (Qualy). Datos cacheados en media/qualy-delta-charts."""
@@ -185,6 +197,11 @@ def qualy_delta_view(request):
     os.makedirs(data_dir, exist_ok=True)
     json_path = os.path.join(data_dir, f"2025_{race_short.lower()}_qualy_delta.json")
 
+    page_key = f"2025_{race_short}"
+    cached = serve_cached_page(request, "qualy-delta", page_key, sources=[json_path])
+    if cached is not None:
+        return cached
+
     payload = None
     if os.path.exists(json_path):
         try:
@@ -265,12 +282,16 @@ def qualy_delta_view(request):
     else:
         error_message = "No hay datos de Qualy disponibles para esta carrera (verifica conexión o caché)."
 
-    return render(request, "qualy_delta.html", {
+    response = render(request, "qualy_delta.html", {
         "chart_html": chart_html,
         "races": [r["full_name"] for r in races_2025],
         "selected_race": selected_race,
         "error_message": error_message
     })
+    # Solo se cachea la página si el gráfico se generó correctamente
+    if chart_html:
+        response = store_page(request, response, "qualy-delta", page_key)
+    return response
 
 def laptimes_view(request):
     
@@ -315,6 +336,7 @@ def comparison_view(request):
     laptimes1, laptimes2, diff = [], [], []
     chart_html = None
     avg_delta = None
+    page_key = None
 
     if driver1 and driver2 and selected_race:
         code1 = _extract_driver_code(driver1)
@@ -322,6 +344,15 @@ def comparison_view(request):
         race_obj = next(r for r in races_2025 if r['full_name'] == selected_race)
         race_short = race_obj['short_name']
 
+        # Solo se cachean selecciones que existen en los desplegables: los
+        # valores de la query acaban en la página (título y <select>)
+        if driver1 in driver_names and driver2 in driver_names and selected_race in race_names:
+            page_key = f"2025_{race_short}_{code1}_{code2}"
+            sources = [_lap_data_path(code1, race_short), _lap_data_path(code2, race_short)]
+            cached = serve_cached_page(request, "comparison", page_key, sources=sources)
+            if cached is not None:
+                return cached
+
         # Load or scrape lap data for both drivers
         laptimes1 = _load_or_scrape_lap_data(code1, selected_race, race_short)
         laptimes2 = _load_or_scrape_lap_data(code2, selected_race, race_short)
@@ -375,7 +406,7 @@ def comparison_view(request):
         )
         chart_html = pio.to_html(fig, full_html=False)
 
-    return render(request, "comparison.html", {
+    response = render(request, "comparison.html", {
         "driver_names": driver_names,
         "race_names": race_names,
         "driver1": driver1,
@@ -384,4 +415,7 @@ def comparison_view(request):
         "chart_html": chart_html,
         "diff": diff,
         "avg_delta": avg_delta
-    })
\ No newline at end of file
+    })
+    if chart_html and page_key:
+        response = store_page(request, response, "comparison", page_key)
+    return response
\ No newline at end of file